@@ -10,6 +10,7 @@ class UserAdmin(BaseUserAdmin):
     list_filter = ('is_active', 'level')
     search_fields = ('email', 'name')
     ordering = ('-created_at',)
+    readonly_fields = ('level',)
     fieldsets = (
         (None, {'fields': ('email', 'password')}),
         ('Profile', {'fields': ('name', 'xp', 'level')}),
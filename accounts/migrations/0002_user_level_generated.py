@@ -0,0 +1,33 @@
+# Generated by Django 5.0.14 on 2026-10-15 22:41
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0001_initial"),
+    ]
+
+    # A regular column can't be altered into a generated one, so drop and re-add it.
+    operations = [
+        migrations.RemoveField(
+            model_name="user",
+            name="level",
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="level",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.expressions.CombinedExpression(
+                    django.db.models.expressions.CombinedExpression(
+                        models.F("xp"), "/", models.Value(100)
+                    ),
+                    "+",
+                    models.Value(1),
+                ),
+                output_field=models.IntegerField(),
+            ),
+        ),
+    ]
@@ -27,7 +27,12 @@ class User(AbstractBaseUser, PermissionsMixin):
     email = models.EmailField(unique=True, db_index=True)
     name = models.CharField(max_length=255)
     xp = models.IntegerField(default=0)
-    level = models.IntegerField(default=1)
+    # Derived by the database from xp, so no write path has to keep it in sync.
+    level = models.GeneratedField(
+        expression=models.F('xp') / 100 + 1,
+        output_field=models.IntegerField(),
+        db_persist=True,
+    )
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
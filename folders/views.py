@@ -4,6 +4,7 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from django.db.models import Count
 from django.shortcuts import get_object_or_404
 from .models import Folder
 
@@ -18,13 +19,17 @@ def folder_list_create(request):
     POST /api/folders/ — create a new folder
     """
     if request.method == 'GET':
-        folders = Folder.objects.filter(user=request.user, is_archived=False)
+        # Count sessions in the same query instead of one COUNT per folder.
+        folders = (
+            Folder.objects.filter(user=request.user, is_archived=False)
+            .annotate(session_count=Count('study_sessions'))
+        )
         data = [{
             'id': f.id,
             'name': f.name,
             'color': f.color,
             'icon': f.icon,
-            'sessionCount': f.study_sessions.count(),
+            'sessionCount': f.session_count,
             'createdAt': int(f.created_at.timestamp() * 1000),
         } for f in folders]
         return Response(data)
@@ -2,8 +2,14 @@
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
 from .models import Game, GameCompletion
 
+User = get_user_model()
+
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -26,17 +32,24 @@ def game_complete(request, game_id):
     from django.shortcuts import get_object_or_404
     game = get_object_or_404(Game, id=game_id)
 
-    completion = GameCompletion.objects.create(
-        user=request.user,
-        game=game,
-        score=request.data.get('score', 0),
-        time_taken=request.data.get('timeTaken', 0),
-        xp_earned=request.data.get('xpEarned', 0),
-    )
-
-    # Award XP
-    request.user.xp += completion.xp_earned
-    request.user.save(update_fields=['xp'])
+    with transaction.atomic():
+        completion = GameCompletion.objects.create(
+            user=request.user,
+            game=game,
+            score=request.data.get('score', 0),
+            time_taken=request.data.get('timeTaken', 0),
+            xp_earned=request.data.get('xpEarned', 0),
+        )
+
+        # Award XP as a single in-database increment, so concurrent completions
+        # can't overwrite each other's totals.
+        User.objects.filter(pk=request.user.pk).update(
+            xp=F('xp') + completion.xp_earned,
+            updated_at=timezone.now(),
+        )
+        # Read the total back while this transaction still holds the row lock,
+        # so totalXP includes any completion that committed concurrently.
+        request.user.xp = User.objects.values_list('xp', flat=True).get(pk=request.user.pk)
 
     return Response({
         'id': completion.id,
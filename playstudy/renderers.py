@@ -0,0 +1,40 @@
+"""orjson-backed DRF renderer — same output as JSONRenderer, encoded in Rust."""
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Compact JSON via orjson, which emits bytes directly.
+
+    Datetimes and anything orjson can't encode natively go through DRF's
+    JSONEncoder.default, so the wire format matches JSONRenderer. Indented,
+    ASCII-only, or non-compact output falls back to the stdlib renderer, as
+    does anything orjson rejects (e.g. integers beyond 64 bits).
+
+    One difference remains: NaN and ±Infinity render as null, where
+    JSONRenderer under STRICT_JSON raises ValueError. orjson has no strict
+    mode, and checking every float would cost more than the encoder saves.
+    The only float this API returns (analyze_content's complexity_score) is
+    always finite.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        if (
+            self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Keep JSONRenderer's escaping of U+2028/U+2029 (strict JavaScript subset).
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
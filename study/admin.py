@@ -1,8 +1,39 @@
 """Study admin registration."""
 from django.contrib import admin
+from django.utils import timezone
 from .models import StudySession, Topic, Question, Flashcard
 
 
+class SessionContentAdmin(admin.ModelAdmin):
+    """
+    Admin for rows inside a session's topic tree. Every save or delete bumps
+    the owning session's updated_at, which versions the cached topic tree.
+    """
+    session_field = 'topic__study_session_id'
+
+    def _session_ids(self, queryset):
+        return set(queryset.values_list(self.session_field, flat=True))
+
+    def _touch_sessions(self, session_ids):
+        StudySession.objects.filter(pk__in=session_ids).update(updated_at=timezone.now())
+
+    def save_model(self, request, obj, form, change):
+        # On change, also bump the session the row is being moved away from.
+        before = self._session_ids(self.model.objects.filter(pk=obj.pk)) if change else set()
+        super().save_model(request, obj, form, change)
+        self._touch_sessions(before | self._session_ids(self.model.objects.filter(pk=obj.pk)))
+
+    def delete_model(self, request, obj):
+        session_ids = self._session_ids(self.model.objects.filter(pk=obj.pk))
+        super().delete_model(request, obj)
+        self._touch_sessions(session_ids)
+
+    def delete_queryset(self, request, queryset):
+        session_ids = self._session_ids(queryset)
+        super().delete_queryset(request, queryset)
+        self._touch_sessions(session_ids)
+
+
 @admin.register(StudySession)
 class StudySessionAdmin(admin.ModelAdmin):
     list_display = ('title', 'user', 'status', 'progress', 'created_at')
@@ -11,16 +42,17 @@ class StudySessionAdmin(admin.ModelAdmin):
 
 
 @admin.register(Topic)
-class TopicAdmin(admin.ModelAdmin):
+class TopicAdmin(SessionContentAdmin):
+    session_field = 'study_session_id'
     list_display = ('title', 'study_session', 'is_category', 'completed', 'order_index')
     list_filter = ('is_category', 'completed')
 
 
 @admin.register(Question)
-class QuestionAdmin(admin.ModelAdmin):
+class QuestionAdmin(SessionContentAdmin):
     list_display = ('question', 'topic', 'correct_answer')
 
 
 @admin.register(Flashcard)
-class FlashcardAdmin(admin.ModelAdmin):
+class FlashcardAdmin(SessionContentAdmin):
     list_display = ('front', 'topic', 'difficulty')
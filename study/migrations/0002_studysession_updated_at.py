@@ -0,0 +1,17 @@
+# Generated by Django 5.0.14 on 2026-10-15 22:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("study", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="studysession",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.14 on 2026-10-15 22:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("folders", "0001_initial"),
+        ("study", "0002_studysession_updated_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="studysession",
+            index=models.Index(
+                fields=["user", "-created_at"], name="study_session_user_created_idx"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="studysession",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="study_sessions",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+    ]
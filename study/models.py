@@ -7,7 +7,10 @@ from django.db import models
 class StudySession(models.Model):
     """Study session with file content, topics, and progress tracking."""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='study_sessions')
+    # No standalone index: study_session_user_created_idx leads with user and covers it.
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='study_sessions', db_index=False,
+    )
     title = models.CharField(max_length=255)
     topic = models.CharField(max_length=255)
     study_content = models.TextField(blank=True, null=True)
@@ -28,10 +31,15 @@ class StudySession(models.Model):
     started_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'study_sessions'
         ordering = ['-created_at']
+        indexes = [
+            # Dashboard/session list: one user's sessions, newest first, straight off the index.
+            models.Index(fields=['user', '-created_at'], name='study_session_user_created_idx'),
+        ]
 
     def __str__(self):
         return f'{self.title} ({self.user.email})'
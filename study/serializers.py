@@ -1,7 +1,12 @@
 """Serializers for the study app."""
 from rest_framework import serializers
+from django.core.cache import cache
+from django.db.models import Prefetch
 from .models import StudySession, Topic, Question, Flashcard
 
+# How long a rendered session topic tree stays cached.
+TOPIC_TREE_CACHE_SECONDS = 60 * 60
+
 
 class QuestionSerializer(serializers.ModelSerializer):
     id = serializers.SerializerMethodField()
@@ -55,8 +60,8 @@ class TopicSerializer(serializers.ModelSerializer):
 
     def get_subtopics(self, obj):
         if obj.is_category:
-            children = obj.subtopics.all().order_by('order_index')
-            return TopicSerializer(children, many=True).data
+            # Meta.ordering already sorts by order_index; .all() keeps prefetched rows usable.
+            return TopicSerializer(obj.subtopics.all(), many=True).data
         return []
 
 
@@ -105,6 +110,24 @@ class StudySessionDetailSerializer(serializers.ModelSerializer):
         return None
 
     def get_extractedTopics(self, obj):
-        # Only top-level categories (no parent)
-        root_topics = obj.topics.filter(parent_topic__isnull=True).order_by('order_index')
+        # The session's updated_at versions the cache key: progress updates save
+        # the session, and the study admins bump it on any Topic, Question or
+        # Flashcard save/delete. A changed tree therefore misses instead of
+        # needing invalidation, even on a per-process cache. Any new code path
+        # that edits those rows must bump updated_at as well.
+        key = f'study-session:{obj.pk}:topics:{obj.updated_at.timestamp()}'
+        return cache.get_or_set(key, lambda: self._build_topic_tree(obj), TOPIC_TREE_CACHE_SECONDS)
+
+    def _build_topic_tree(self, obj):
+        # Only top-level categories (no parent). Subtopics, questions, and
+        # flashcards are prefetched so the nested serializers don't query per topic.
+        root_topics = (
+            obj.topics.filter(parent_topic__isnull=True)
+            .order_by('order_index')
+            .prefetch_related(
+                'questions',
+                'flashcards',
+                Prefetch('subtopics', queryset=Topic.objects.prefetch_related('questions', 'flashcards')),
+            )
+        )
         return TopicSerializer(root_topics, many=True).data
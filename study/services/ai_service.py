@@ -3,9 +3,12 @@ AI service — content extraction, analysis, and topic/question generation.
 Ported from FastAPI study_sessions.py to a clean Django service.
 """
 import io
+import re
 import json
+import functools
 import logging
 import base64
+import zlib
 from django.conf import settings
 
 logger = logging.getLogger(__name__)
@@ -96,10 +99,17 @@ def detect_file_type(content: str) -> tuple:
     return (cleaned if cleaned else content, 'txt', content)
 
 
+_LAYOUT_WHITESPACE = str.maketrans('', '', '\n\r\t')
+
+
 def _looks_like_text(s: str) -> bool:
     """Heuristic: is this decoded blob readable plain text rather than binary?"""
     if not s:
         return False
+    # Fast path for the common case: once line breaks and tabs are dropped,
+    # ordinary text is entirely printable, which str.isprintable checks in C.
+    if s.translate(_LAYOUT_WHITESPACE).isprintable():
+        return True
     # Reject if a large fraction of characters are outside common printable range.
     printable = sum(1 for c in s if c.isprintable() or c in '\n\r\t')
     return (printable / len(s)) > 0.9
@@ -113,8 +123,9 @@ def analyze_complexity(text: str) -> dict:
     word_count = len(words)
     unique_words = len(set(w.lower() for w in words if w.isalnum()))
     unique_ratio = unique_words / max(word_count, 1)
-    avg_word_len = sum(len(w) for w in words) / max(word_count, 1)
-    sentences = len([c for c in text if c in '.!?'])
+    avg_word_len = sum(map(len, words)) / max(word_count, 1)
+    # str.count scans in C; no per-character list of the whole document.
+    sentences = text.count('.') + text.count('!') + text.count('?')
     avg_sent_len = word_count / max(sentences, 1)
 
     complexity = min(1.0, unique_ratio * 0.4 + min(avg_word_len / 8, 1.0) * 0.3 + min(avg_sent_len / 25, 1.0) * 0.3)
@@ -172,11 +183,23 @@ def generate_topics_and_questions(text: str, num_topics: int, questions_per_topi
     return _generate_placeholder(text, num_topics, questions_per_topic)
 
 
-def _generate_with_anthropic(text: str, num_topics: int, qpt: int) -> list:
-    """Generate using Claude Haiku 4.5 — fast and cheap for structured JSON."""
+@functools.lru_cache(maxsize=None)
+def _anthropic_client(api_key: str):
+    """Process-wide Anthropic client, so its connection pool survives between requests."""
     from anthropic import Anthropic
+    return Anthropic(api_key=api_key)
+
 
-    client = Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+@functools.lru_cache(maxsize=None)
+def _openai_client(api_key: str):
+    """Process-wide OpenAI client, so its connection pool survives between requests."""
+    from openai import OpenAI
+    return OpenAI(api_key=api_key)
+
+
+def _generate_with_anthropic(text: str, num_topics: int, qpt: int) -> list:
+    """Generate using Claude Haiku 4.5 — fast and cheap for structured JSON."""
+    client = _anthropic_client(settings.ANTHROPIC_API_KEY)
     prompt = _build_prompt(text, num_topics, qpt)
 
     # Haiku 4.5 — current model (replaces the retired claude-3-5-haiku-latest).
@@ -187,27 +210,45 @@ def _generate_with_anthropic(text: str, num_topics: int, qpt: int) -> list:
         messages=[{'role': 'user', 'content': prompt}],
     )
 
+    # A response cut off at max_tokens is an unterminated JSON array; treat it
+    # as a miss so the caller falls through instead of parsing a fragment.
+    if response.stop_reason == 'max_tokens':
+        logger.warning('Anthropic response truncated at max_tokens (%d output tokens)',
+                       response.usage.output_tokens)
+        return []
+
     return _parse_ai_response(response.content[0].text)
 
 
 def _generate_with_openai(text: str, num_topics: int, qpt: int) -> list:
     """Generate using OpenAI as a backup provider."""
-    from openai import OpenAI
-
-    client = OpenAI(api_key=settings.OPENAI_API_KEY)
-    prompt = _build_prompt(text, num_topics, qpt)
+    client = _openai_client(settings.OPENAI_API_KEY)
+    # JSON mode only allows a top-level object, so ask for the array under "topics".
+    prompt = _build_prompt(text, num_topics, qpt, json_object=True)
 
     response = client.chat.completions.create(
         model='gpt-4o-mini',
         messages=[{'role': 'user', 'content': prompt}],
         max_tokens=8000,
+        response_format={'type': 'json_object'},
     )
 
-    return _parse_ai_response(response.choices[0].message.content)
+    choice = response.choices[0]
+    if choice.finish_reason == 'length':
+        logger.warning('OpenAI response truncated at max_tokens (%d completion tokens)',
+                       response.usage.completion_tokens)
+        return []
+
+    return _parse_ai_response(choice.message.content)
 
 
-def _build_prompt(text: str, num_topics: int, qpt: int) -> str:
-    """Build the AI prompt for topic/question/flashcard generation."""
+def _build_prompt(text: str, num_topics: int, qpt: int, json_object: bool = False) -> str:
+    """
+    Build the AI prompt for topic/question/flashcard generation.
+
+    With json_object=True the schema asks for the topic array under a "topics"
+    key, for providers whose JSON mode only allows a top-level object.
+    """
     # Truncate text if too long
     max_chars = 60000
     if len(text) > max_chars:
@@ -215,42 +256,46 @@ def _build_prompt(text: str, num_topics: int, qpt: int) -> str:
 
     fpt = max(4, min(8, qpt // 2))  # flashcards per subtopic
 
-    return f"""Analyze the following study material and create a structured learning plan.
-
-Create {num_topics} main topic categories, each with 2-3 subtopics.
-For each subtopic, generate:
-  - {qpt} multiple-choice questions (with exactly 4 options each, one correct)
-  - {fpt} flashcards, each with a concise prompt (front) and a clear, self-contained answer (back).
-    Flashcards MUST be derivable from the source material. The "front" is the prompt, the "back" is the answer.
-
-Return ONLY valid JSON in this exact format (no markdown, no prose before or after):
-[
-  {{
+    topics_schema = """[
+  {
     "title": "Category Title",
     "description": "Brief description",
     "subtopics": [
-      {{
+      {
         "title": "Subtopic Title",
         "description": "Brief description",
         "flashcards": [
-          {{
+          {
             "front": "What is ... ?",
             "back": "A clear, direct answer in 1-2 sentences.",
             "hint": "Optional one-line hint (may be null)"
-          }}
+          }
         ],
         "questions": [
-          {{
+          {
             "question": "Question text?",
             "options": ["A", "B", "C", "D"],
             "correct_answer": 0,
             "explanation": "Why A is correct"
-          }}
+          }
         ]
-      }}
+      }
     ]
-  }}
-]
+  }
+]"""
+    if json_object:
+        topics_schema = '{\n  "topics": ' + topics_schema.replace('\n', '\n  ') + '\n}'
+
+    return f"""Analyze the following study material and create a structured learning plan.
+
+Create {num_topics} main topic categories, each with 2-3 subtopics.
+For each subtopic, generate:
+  - {qpt} multiple-choice questions (with exactly 4 options each, one correct)
+  - {fpt} flashcards, each with a concise prompt (front) and a clear, self-contained answer (back).
+    Flashcards MUST be derivable from the source material. The "front" is the prompt, the "back" is the answer.
+
+Return ONLY valid JSON in this exact format (no markdown, no prose before or after):
+{topics_schema}
 
 STUDY MATERIAL:
 {text}"""
@@ -258,6 +303,16 @@ STUDY MATERIAL:
 
 def _parse_ai_response(text: str) -> list:
     """Parse the AI response JSON."""
+    # JSON-mode responses parse directly; anything else gets the bracket scan.
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        data = None
+    if isinstance(data, dict):
+        data = data.get('topics')
+    if isinstance(data, list):
+        return data
+
     # Find JSON in the response
     start = text.find('[')
     end = text.rfind(']') + 1
@@ -268,7 +323,7 @@ def _parse_ai_response(text: str) -> list:
     try:
         return json.loads(text[start:end])
     except json.JSONDecodeError as e:
-        logger.error(f'Failed to parse AI JSON: {e}')
+        logger.error('Failed to parse AI JSON: %s', e)
         return []
 
 
@@ -286,9 +341,11 @@ def _generate_placeholder(text: str, num_topics: int, qpt: int) -> list:
 
     n_topics = max(1, min(num_topics, 4))
     chunk_size = max(1, len(sentences) // n_topics)
-    # Build the pool of all derivable flashcards once so we can use them as
-    # distractors across chunks, and to pad when a chunk is small.
-    all_cards = [c for c in (_flashcard_from_sentence(s) for s in sentences) if c]
+    # Derive each sentence's flashcard once; the chunk helpers below look cards
+    # up here instead of re-scoring the same sentences. The resulting pool is
+    # also used for distractors across chunks, and to pad when a chunk is small.
+    card_cache = {s: _flashcard_from_sentence(s) for s in sentences}
+    all_cards = [c for c in (card_cache[s] for s in sentences) if c]
     topics = []
 
     for i in range(n_topics):
@@ -300,8 +357,10 @@ def _generate_placeholder(text: str, num_topics: int, qpt: int) -> list:
 
         title = _topic_title(chunk, i)
         subtopic_title = _subtopic_title(chunk, i)
-        flashcards = _flashcards_from_sentences(chunk, limit=max(4, min(8, qpt // 2)))
-        questions = _questions_from_sentences(chunk, limit=min(qpt, 6), distractor_pool=all_cards)
+        flashcards = _flashcards_from_sentences(chunk, limit=max(4, min(8, qpt // 2)), card_cache=card_cache)
+        questions = _questions_from_sentences(
+            chunk, limit=min(qpt, 6), distractor_pool=all_cards, card_cache=card_cache,
+        )
 
         topics.append({
             'title': title,
@@ -345,18 +404,21 @@ def _subtopic_title(chunk: list, idx: int) -> str:
     return ' '.join(words[:10]) + ('…' if len(words) > 10 else '')
 
 
+_SENTENCE_BOUNDARY_RE = re.compile(r'(?<=[.!?])\s+')
+
+
 def _sentences(text: str) -> list:
     """Split text into non-trivial sentences."""
-    import re
-    raw = re.split(r'(?<=[.!?])\s+', (text or '').strip())
-    return [s.strip() for s in raw if len(s.strip()) > 12]
+    raw = _SENTENCE_BOUNDARY_RE.split((text or '').strip())
+    return [s for s in (r.strip() for r in raw) if len(s) > 12]
 
 
-def _flashcards_from_sentences(sents: list, limit: int) -> list:
+def _flashcards_from_sentences(sents: list, limit: int, card_cache: dict | None = None) -> list:
     """Turn sentences into front/back flashcards by extracting a keyword."""
+    card_for = card_cache.get if card_cache is not None else _flashcard_from_sentence
     cards = []
     for s in sents[:limit * 2]:
-        card = _flashcard_from_sentence(s)
+        card = card_for(s)
         if card:
             cards.append(card)
         if len(cards) >= limit:
@@ -381,6 +443,8 @@ _STOPWORDS = {
     'can', 'may', 'will', 'would', 'should', 'could', 'has', 'have', 'had',
 }
 
+_NON_TERM_CHARS_RE = re.compile(r'[^A-Za-z0-9\-]')
+
 
 def _flashcard_from_sentence(sentence: str) -> dict | None:
     """
@@ -389,14 +453,13 @@ def _flashcard_from_sentence(sentence: str) -> dict | None:
     Scores each non-stopword token for how "content-bearing" it is (capitalisation,
     length, digits), then blanks out the highest scorer.
     """
-    import re
     words = sentence.split()
     if len(words) < 5:
         return None
 
     candidates = []
     for i, w in enumerate(words):
-        stripped = re.sub(r'[^A-Za-z0-9\-]', '', w)
+        stripped = _NON_TERM_CHARS_RE.sub('', w)
         if not stripped or stripped.lower() in _STOPWORDS:
             continue
         score = 0
@@ -417,8 +480,8 @@ def _flashcard_from_sentence(sentence: str) -> dict | None:
     if not candidates:
         return None
 
-    candidates.sort(key=lambda t: (-t[0], t[1]))
-    _, idx, term = candidates[0]
+    # Only the best candidate is used — a single pass, not a full sort.
+    _, idx, term = min(candidates, key=lambda t: (-t[0], t[1]))
     masked = list(words)
     masked[idx] = '______'
     front = ' '.join(masked).strip().rstrip('.').rstrip(',')
@@ -429,21 +492,29 @@ def _flashcard_from_sentence(sentence: str) -> dict | None:
     }
 
 
-def _questions_from_sentences(sents: list, limit: int, distractor_pool: list | None = None) -> list:
+def _questions_from_sentences(
+    sents: list, limit: int, distractor_pool: list | None = None, card_cache: dict | None = None,
+) -> list:
     """Cheap multiple-choice generator for when no AI is available."""
     import random
-    chunk_pool = [c for c in (_flashcard_from_sentence(s) for s in sents) if c]
+    card_for = card_cache.get if card_cache is not None else _flashcard_from_sentence
+    chunk_pool = [c for c in (card_for(s) for s in sents) if c]
     # Global pool lets us pull distractors from outside this chunk when we run out.
     global_pool = distractor_pool or chunk_pool
+    # Lower-case each answer once rather than per (question, candidate) pair.
+    pool_backs = [(c['back'], c['back'].lower()) for c in global_pool]
 
     questions = []
     for i, card in enumerate(chunk_pool[:limit]):
         correct = card['back']
-        distractors = [c['back'] for c in global_pool if c['back'].lower() != correct.lower()]
-        # Stable per-answer shuffle so tests are deterministic.
-        rng = random.Random(hash(correct) & 0xFFFFFFFF)
-        rng.shuffle(distractors)
-        options = [correct] + distractors[:3]
+        correct_lower = correct.lower()
+        distractors = [back for back, lower in pool_backs if lower != correct_lower]
+        # Stable per-answer draw so tests are deterministic. Only three are
+        # kept, so sample them instead of shuffling the whole pool. crc32, not
+        # hash(): str hashing is salted per process, so every worker would
+        # otherwise order the options differently.
+        rng = random.Random(zlib.crc32(correct.encode()))
+        options = [correct] + rng.sample(distractors, min(3, len(distractors)))
         while len(options) < 4:
             options.append(f'Option {chr(ord("A") + len(options))}')
         rng.shuffle(options)
@@ -456,7 +527,9 @@ def _questions_from_sentences(sents: list, limit: int, distractor_pool: list | N
 
     # If we still didn't reach the target, synthesise simple true/false-style
     # questions from remaining sentences rather than emitting "placeholder N".
-    remaining_sents = [s for s in sents if not any(s.startswith(c['front'].split('______')[0][:20]) for c in chunk_pool[:limit])]
+    # Prefixes are computed once; str.startswith(tuple) checks them all in one C call.
+    used_prefixes = tuple(c['front'].split('______')[0][:20] for c in chunk_pool[:limit])
+    remaining_sents = [s for s in sents if not s.startswith(used_prefixes)]
     while len(questions) < limit and remaining_sents:
         s = remaining_sents.pop(0)
         lead = s.split('.')[0][:120]
@@ -8,7 +8,8 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
-from django.db import transaction
+from django.db import DatabaseError, transaction
+from django.db.models import Count, Q
 from .models import StudySession, Topic, Question, Flashcard
 from .serializers import StudySessionListSerializer, StudySessionDetailSerializer
 from .permissions import IsSessionOwner
@@ -29,8 +30,10 @@ def app_data(request):
     user = request.user
     sessions = StudySession.objects.filter(user=user).order_by('-created_at')
 
-    total_sessions = sessions.count()
-    completed_sessions = sessions.filter(is_completed=True).count()
+    counts = sessions.aggregate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(is_completed=True)),
+    )
     total_xp = user.xp
 
     return Response({
@@ -42,8 +45,8 @@ def app_data(request):
             'level': user.level,
         },
         'stats': {
-            'totalSessions': total_sessions,
-            'completedSessions': completed_sessions,
+            'totalSessions': counts['total'],
+            'completedSessions': counts['completed'],
             'totalXP': total_xp,
             'level': user.level,
         },
@@ -119,7 +122,7 @@ def analyze_content(request):
             'content_summary': extracted[:200] + ('...' if len(extracted) > 200 else ''),
         })
     except Exception as e:
-        logger.error(f'Content analysis failed: {e}')
+        logger.error('Content analysis failed: %s', e)
         return Response(
             {'detail': f'Failed to analyze content: {str(e)}'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -190,7 +193,9 @@ def create_with_ai(request):
                 status='in_progress',
             )
 
-            # Save topics, subtopics, questions, and flashcards.
+            # Save topics, subtopics, questions, and flashcards. The first
+            # subtopic that actually saves is the one unlocked for the quiz.
+            unlocked = False
             for idx, t_data in enumerate(topics_data):
                 category = Topic.objects.create(
                     study_session=session,
@@ -200,47 +205,75 @@ def create_with_ai(request):
                     is_category=True,
                 )
 
+                saved_subtopics = 0
                 for sub_idx, sub_data in enumerate(t_data.get('subtopics', [])):
-                    subtopic = Topic.objects.create(
-                        study_session=session,
-                        parent_topic=category,
-                        title=sub_data['title'],
-                        description=sub_data.get('description', ''),
-                        order_index=sub_idx,
-                        is_category=False,
-                        workflow_stage='quiz_available' if idx == 0 and sub_idx == 0 else 'locked',
-                    )
-
-                    for q_idx, q_data in enumerate(sub_data.get('questions', [])):
-                        Question.objects.create(
-                            topic=subtopic,
-                            question=q_data['question'],
-                            options=q_data.get('options', []),
-                            correct_answer=q_data.get('correct_answer', 0),
-                            explanation=q_data.get('explanation', ''),
-                            source_text=q_data.get('source_text'),
-                            source_page=q_data.get('source_page'),
-                            order_index=q_idx,
-                        )
-                        questions_created += 1
-
-                    # Flashcards — fall back to deriving from questions if the AI didn't return any.
-                    flashcards = ensure_flashcards_on_subtopic(sub_data, source_sentences)
-                    for fc_idx, fc in enumerate(flashcards):
-                        front = (fc.get('front') or '').strip()
-                        back = (fc.get('back') or '').strip()
-                        if not front or not back:
-                            continue
-                        Flashcard.objects.create(
-                            topic=subtopic,
-                            front=front,
-                            back=back,
-                            hint=(fc.get('hint') or None),
-                            order_index=fc_idx,
-                        )
-                        flashcards_created += 1
-
-        session.refresh_from_db()
+                    # Each subtopic gets its own savepoint: malformed AI output for
+                    # one subtopic is dropped without discarding the whole session.
+                    try:
+                        with transaction.atomic():
+                            subtopic = Topic.objects.create(
+                                study_session=session,
+                                parent_topic=category,
+                                title=sub_data['title'],
+                                description=sub_data.get('description', ''),
+                                order_index=sub_idx,
+                                is_category=False,
+                                workflow_stage='locked' if unlocked else 'quiz_available',
+                            )
+
+                            questions = [
+                                Question(
+                                    topic=subtopic,
+                                    question=q_data['question'],
+                                    options=q_data.get('options', []),
+                                    correct_answer=q_data.get('correct_answer', 0),
+                                    explanation=q_data.get('explanation', ''),
+                                    source_text=q_data.get('source_text'),
+                                    source_page=q_data.get('source_page'),
+                                    order_index=q_idx,
+                                )
+                                for q_idx, q_data in enumerate(sub_data.get('questions', []))
+                            ]
+                            Question.objects.bulk_create(questions)
+
+                            # Flashcards — fall back to deriving from questions if the AI didn't return any.
+                            flashcards = []
+                            for fc_idx, fc in enumerate(ensure_flashcards_on_subtopic(sub_data, source_sentences)):
+                                front = (fc.get('front') or '').strip()
+                                back = (fc.get('back') or '').strip()
+                                if not front or not back:
+                                    continue
+                                flashcards.append(Flashcard(
+                                    topic=subtopic,
+                                    front=front,
+                                    back=back,
+                                    hint=(fc.get('hint') or None),
+                                    order_index=fc_idx,
+                                ))
+                            Flashcard.objects.bulk_create(flashcards)
+                    except (DatabaseError, KeyError) as exc:
+                        logger.error('Skipping subtopic %d of topic %d: %s', sub_idx, idx, exc)
+                        continue
+
+                    unlocked = True
+                    saved_subtopics += 1
+                    questions_created += len(questions)
+                    flashcards_created += len(flashcards)
+
+                if not saved_subtopics:
+                    # All of this category's subtopics were dropped; don't leave
+                    # an empty node in the user's topic tree.
+                    category.delete()
+
+            if not unlocked:
+                # Every subtopic was dropped — don't leave an empty session behind.
+                # The AI output was unusable, so report it as an upstream failure.
+                transaction.set_rollback(True)
+                return Response(
+                    {'detail': 'Failed to create study session: the generated content had no usable subtopics.'},
+                    status=status.HTTP_502_BAD_GATEWAY
+                )
+
         logger.info(
             'Session %s created for %s — %d questions, %d flashcards',
             session.id, request.user.email, questions_created, flashcards_created,
@@ -265,7 +298,7 @@ def create_with_ai(request):
         }, status=status.HTTP_201_CREATED)
 
     except Exception as e:
-        logger.error(f'AI session creation failed: {e}', exc_info=True)
+        logger.error('AI session creation failed: %s', e, exc_info=True)
         return Response(
             {'detail': f'Failed to create study session: {str(e)}'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -274,6 +307,14 @@ def create_with_ai(request):
 
 # ─── Progress Updates ────────────────────────────────────
 
+# Request key → Topic field for per-topic progress updates.
+_PROGRESS_FIELDS = {
+    'completed': 'completed',
+    'score': 'score',
+    'currentQuestionIndex': 'current_question_index',
+}
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def update_progress(request, session_id):
@@ -282,28 +323,39 @@ def update_progress(request, session_id):
     Update topic progress. IDOR-safe.
     """
     session = get_object_or_404(StudySession, id=session_id, user=request.user)
-    updates = request.data.get('updates', [])
-
+    updates = [u for u in request.data.get('updates', []) if u.get('topicDbId')]
+
+    # One SELECT for every referenced topic (scoped to this session, so foreign
+    # ids are simply skipped) and one bulk UPDATE, instead of a query pair per topic.
+    topics = {
+        str(t.pk): t
+        for t in session.topics.filter(id__in=[u['topicDbId'] for u in updates])
+    }
+    dirty = {}
+    changed_fields = set()
     for update in updates:
-        topic_db_id = update.get('topicDbId')
-        if not topic_db_id:
-            continue
-        try:
-            topic = Topic.objects.get(id=topic_db_id, study_session=session)
-            if 'completed' in update:
-                topic.completed = update['completed']
-            if 'score' in update:
-                topic.score = update['score']
-            if 'currentQuestionIndex' in update:
-                topic.current_question_index = update['currentQuestionIndex']
-            topic.save()
-        except Topic.DoesNotExist:
+        topic = topics.get(str(update['topicDbId']))
+        if topic is None:
             continue
-
-    # Recalculate session progress
-    total = session.topics.filter(is_category=False).count()
-    done = session.topics.filter(is_category=False, completed=True).count()
-    session.progress = int((done / max(total, 1)) * 100)
-    session.save()
+        for key, field in _PROGRESS_FIELDS.items():
+            if key in update:
+                setattr(topic, field, update[key])
+                changed_fields.add(field)
+        dirty[topic.pk] = topic
+
+    # Nothing to apply (empty batch, unknown ids, no recognised keys): progress
+    # can't have moved, so skip the recount and the session write.
+    if not changed_fields:
+        return Response({'progress': session.progress})
+
+    Topic.objects.bulk_update(dirty.values(), sorted(changed_fields))
+
+    # Recalculate session progress — both counts in one aggregate scan.
+    counts = session.topics.filter(is_category=False).aggregate(
+        total=Count('id'),
+        done=Count('id', filter=Q(completed=True)),
+    )
+    session.progress = int((counts['done'] / max(counts['total'], 1)) * 100)
+    session.save(update_fields=['progress', 'updated_at'])
 
     return Response({'progress': session.progress})